@@ -6,19 +6,41 @@ PASSWORD: 1234 (default)
 """
 
 import psutil
+import re
 import time
 import threading
 import hashlib
+import hmac
 import json
 import os
+import queue
+import secrets
+import signal
 import subprocess
+from getpass import getpass
+
+try:
+    # PyObjC - lets us react to app launches instead of polling processes
+    from AppKit import NSWorkspace, NSApplication
+    from Foundation import NSRunLoop, NSDate
+except ImportError:
+    NSWorkspace = None
 
 # ============== CONFIGURATION ==============
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locker_config.json")
 
+DEFAULT_PASSWORD = "1234"
+
+# scrypt cost parameters (~32 MB, ~100-200 ms per hash)
+SCRYPT_PARAMS = {"n": 32768, "r": 8, "p": 1, "dklen": 32, "maxmem": 64 * 1024 * 1024}
+
 DEFAULT_CONFIG = {
-    # SHA256 hash of password (default: "1234")
-    "password_hash": hashlib.sha256("1234".encode()).hexdigest(),
+    # Key derivation function used for password_hash
+    "kdf": "scrypt",
+    # Random per-config salt (hex), generated when the config is created
+    "salt": None,
+    # scrypt hash of password (default: "1234"), filled in with the salt
+    "password_hash": None,
     # Apps to lock (keywords - case insensitive partial match)
     "locked_apps": [
         "whatsapp",
@@ -26,70 +48,230 @@ DEFAULT_CONFIG = {
         "discord",
         # Add more as needed (lowercase)
     ],
-    # Check interval in seconds (faster = more responsive)
-    "check_interval": 0.3
 }
 
+# Parsed config, reused until the file's mtime changes
+_config_cache = {"mtime": None, "data": None}
+
 def load_config():
-    """Load config from file or create default."""
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    else:
-        save_config(DEFAULT_CONFIG)
-        return DEFAULT_CONFIG
+    """Load config from file (cached by mtime) or create default."""
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime
+    except FileNotFoundError:
+        config = dict(DEFAULT_CONFIG, locked_apps=list(DEFAULT_CONFIG["locked_apps"]))
+        config["salt"] = secrets.token_bytes(16).hex()
+        config["password_hash"] = hash_password(DEFAULT_PASSWORD, config)
+        save_config(config)
+        return config
+
+    if mtime == _config_cache["mtime"]:
+        return _config_cache["data"]
+
+    with open(CONFIG_FILE, 'r') as f:
+        config = json.load(f)
+    if "salt" not in config:
+        # Legacy config: unsalted SHA256 hash, upgraded on next password change
+        config["kdf"] = "sha256"
+
+    _config_cache["mtime"] = mtime
+    _config_cache["data"] = config
+    return config
 
 def save_config(config):
     """Save config to file."""
+    # Drop the cache first - callers mutate the cached dict before saving, so
+    # a failed write must not leave those unsaved changes cached
+    _config_cache["mtime"] = None
+    _config_cache["data"] = None
     with open(CONFIG_FILE, 'w') as f:
         json.dump(config, f, indent=2)
 
-def hash_password(password):
-    """Hash password using SHA256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+def derive_key(password, config):
+    """Derive raw key bytes from a str/bytes password using the config's KDF (scrypt, or SHA256 for legacy configs)."""
+    if isinstance(password, str):
+        password = password.encode()
+    if config.get("kdf") == "scrypt":
+        salt = bytes.fromhex(config["salt"])
+        return hashlib.scrypt(password, salt=salt, **SCRYPT_PARAMS)
+    return hashlib.sha256(password).digest()
+
+def hash_password(password, config):
+    """Hash password for storage in the config (hex)."""
+    return derive_key(password, config).hex()
+
+def check_password(password, config):
+    """Check password against the stored hash in constant time."""
+    return hmac.compare_digest(derive_key(password, config), bytes.fromhex(config["password_hash"]))
 
 # ============== macOS APP CONTROL ==============
 
-def run_applescript(script):
-    """Run AppleScript and return output."""
-    try:
-        result = subprocess.run(
-            ['osascript', '-e', script],
-            capture_output=True,
-            text=True,
-            timeout=5
+# Handlers compiled once when the osascript session starts, then called by name
+APPLESCRIPT_HANDLERS = '''
+on hideApp(appName)
+    tell application "System Events"
+        set visible of process appName to false
+    end tell
+end hideApp
+
+on showApp(appName)
+    tell application appName
+        activate
+    end tell
+end showApp
+
+on quitApp(appName)
+    tell application appName
+        quit
+    end tell
+end quitApp
+
+on promptPassword(appName, remaining, wasWrong, secondsLeft)
+    set msg to "🔒 " & appName & " is locked" & linefeed & linefeed & "Enter password to unlock:" & linefeed & "(" & remaining & " attempts remaining)"
+    if wasWrong then set msg to "❌ Wrong password!" & linefeed & linefeed & msg
+    tell application "System Events"
+        activate
+        try
+            set userInput to display dialog msg ¬
+                default answer "" ¬
+                with hidden answer ¬
+                buttons {"Cancel", "Unlock"} ¬
+                default button "Unlock" ¬
+                with icon caution ¬
+                with title "App Locker" ¬
+                giving up after secondsLeft
+        on error number -128
+            return "CANCEL"
+        end try
+        if gave up of userInput then return "CANCEL"
+        return "OK:" & text returned of userInput
+    end tell
+end promptPassword
+'''
+
+def applescript_string(value):
+    """Quote a Python string as an AppleScript string literal."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+class OsascriptSession:
+    """Long-lived interactive osascript process, so each script doesn't pay for a spawn."""
+
+    SENTINEL = b"<<<END>>>"
+    # Prefixes the interactive REPL puts in front of prompts and results
+    PROMPT_PREFIXES = (b"?> ", b">> ", b"=> ")
+    # Backslash escapes used in AppleScript string literals
+    ESCAPES = {b'"': b'"', b'\\': b'\\', b'n': b'\n', b't': b'\t', b'r': b'\r'}
+
+    def __init__(self):
+        self.proc = None
+        self.lines = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Start (or restart) the osascript REPL and define the handlers."""
+        self.proc = subprocess.Popen(
+            ['osascript', '-i', '-l', 'AppleScript'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,  # Keep error text out of a full, unread pipe
+            # No text=True: output may carry a password, keep it as undecoded bytes
         )
-        return result.stdout.strip()
+        self.lines = queue.Queue()
+        threading.Thread(
+            target=self._read_output,
+            args=(self.proc.stdout, self.lines),
+            daemon=True
+        ).start()
+        self._exchange(APPLESCRIPT_HANDLERS, timeout=5)
+
+    def ensure_started(self):
+        """Start the REPL if it isn't running."""
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+
+    @staticmethod
+    def _read_output(stream, lines):
+        for line in stream:
+            lines.put(line.rstrip(b"\n"))
+        lines.put(None)  # EOF - process exited
+
+    @classmethod
+    def _clean_line(cls, line):
+        """Strip REPL decoration from an output line."""
+        # Prompts can pile up in front of a result (e.g. ">> >> => ...")
+        stripped = True
+        while stripped:
+            stripped = False
+            for prefix in cls.PROMPT_PREFIXES:
+                if line.startswith(prefix):
+                    line = line[len(prefix):]
+                    stripped = True
+        if len(line) >= 2 and line.startswith(b'"') and line.endswith(b'"'):
+            # Result printed as a string literal
+            line = re.sub(rb'\\(["\\ntr])', lambda m: cls.ESCAPES[m.group(1)], line[1:-1])
+        return line
+
+    def _exchange(self, script, timeout):
+        """Send script followed by the sentinel and collect output (a wipeable bytearray) up to it."""
+        # The sentinel is an expression, so the REPL prints it as a result on
+        # stdout, in order after the script's own result
+        self.proc.stdin.write(f'{script}\n"{self.SENTINEL.decode()}"\n'.encode())
+        self.proc.stdin.flush()
+
+        output = bytearray()
+        deadline = time.time() + timeout
+        while True:
+            try:
+                line = self.lines.get(timeout=max(0, deadline - time.time()))
+            except queue.Empty:
+                # Unknown REPL state - throw it away, next call restarts it
+                self.proc.kill()
+                raise subprocess.TimeoutExpired('osascript', timeout)
+            if line is None:
+                raise RuntimeError("osascript exited")
+            if self.SENTINEL in line:
+                break
+            line = self._clean_line(line)
+            if line.strip():
+                if output:
+                    output += b"\n"
+                output += line
+
+        return output
+
+    def run(self, script, timeout=5):
+        """Run script in the REPL and return its output lines joined."""
+        return self.run_bytes(script, timeout).decode(errors="replace").strip()
+
+    def run_bytes(self, script, timeout=5):
+        """Run script in the REPL and return its raw output (bytearray), undecoded and unstripped."""
+        with self.lock:
+            self.ensure_started()
+            return self._exchange(script, timeout)
+
+OSA_SESSION = OsascriptSession()
+# Separate session for the password dialog, so hide/show calls never wait
+# behind a dialog that is open for up to UNLOCK_TIMEOUT
+DIALOG_SESSION = OsascriptSession()
+
+def run_applescript(script, timeout=5):
+    """Run AppleScript in the shared osascript session and return output."""
+    try:
+        return OSA_SESSION.run(script, timeout)
     except Exception as e:
         print(f"AppleScript error: {e}")
         return None
 
 def hide_app(app_name):
     """Hide an app using AppleScript."""
-    script = f'''
-    tell application "System Events"
-        set visible of process "{app_name}" to false
-    end tell
-    '''
-    return run_applescript(script)
+    return run_applescript(f"hideApp({applescript_string(app_name)})")
 
 def show_app(app_name):
     """Show and activate an app using AppleScript."""
-    script = f'''
-    tell application "{app_name}"
-        activate
-    end tell
-    '''
-    return run_applescript(script)
+    return run_applescript(f"showApp({applescript_string(app_name)})")
 
 def quit_app(app_name):
     """Quit an app using AppleScript."""
-    script = f'''
-    tell application "{app_name}"
-        quit
-    end tell
-    '''
-    return run_applescript(script)
+    return run_applescript(f"quitApp({applescript_string(app_name)})")
 
 def open_app(app_name):
     """Open/launch an app using the open command."""
@@ -102,76 +284,107 @@ def open_app(app_name):
 def terminate_process(pid):
     """Terminate a process by PID using SIGKILL."""
     try:
-        os.kill(pid, 9)  # SIGKILL
+        os.kill(pid, signal.SIGKILL)
         return True
-    except:
-        try:
-            proc = psutil.Process(pid)
-            proc.kill()
-            return True
-        except:
-            return False
+    except ProcessLookupError:
+        return True  # Already gone
+    except OSError:
+        return False
+
+def freeze_process(pid):
+    """Suspend a process by PID using SIGSTOP."""
+    try:
+        os.kill(pid, signal.SIGSTOP)
+        return True
+    except OSError:
+        return False
+
+def resume_process(pid):
+    """Resume a suspended process by PID using SIGCONT."""
+    try:
+        os.kill(pid, signal.SIGCONT)
+        return True
+    except OSError:
+        return False
 
 # ============== PASSWORD DIALOG (Native macOS) ==============
 
-def show_password_dialog(app_name):
+# Seconds allowed for a whole unlock (all attempts together)
+UNLOCK_TIMEOUT = 60
+
+def prompt_call(app_name, remaining, was_wrong, deadline):
+    """Build a promptPassword call and the seconds left until deadline."""
+    # Native macOS dialog (promptPassword handler), returns "OK:<password>" or "CANCEL".
+    # After a wrong attempt the prompt itself says so; the dialog gives up at the deadline.
+    seconds_left = int(deadline - time.time())
+    call = (
+        f"promptPassword({applescript_string(app_name)}, {remaining}, "
+        f"{'true' if was_wrong else 'false'}, {seconds_left})"
+    )
+    return call, seconds_left
+
+def prompt_password_once(call, timeout):
+    """Run a promptPassword call in a one-shot osascript (fallback when the session fails)."""
+    result = subprocess.run(
+        ['osascript', '-'],
+        input=f"{APPLESCRIPT_HANDLERS}\n{call}\n".encode(),
+        capture_output=True,
+        timeout=timeout
+    )
+    return bytearray(result.stdout.rstrip(b"\n"))
+
+def show_password_dialog(app_name, config):
     """Show native macOS password dialog. Returns True if correct password."""
-    config = load_config()
     max_attempts = 3
+    # One time budget for the whole unlock, shared by all attempts
+    deadline = time.time() + UNLOCK_TIMEOUT
+    use_session = True
 
     for attempt in range(max_attempts):
         remaining = max_attempts - attempt
 
-        # Native macOS dialog using AppleScript
-        script = f'''
-        tell application "System Events"
-            activate
-            set userInput to display dialog "🔒 {app_name} is locked\\n\\nEnter password to unlock:\\n({remaining} attempts remaining)" ¬
-                default answer "" ¬
-                with hidden answer ¬
-                buttons {{"Cancel", "Unlock"}} ¬
-                default button "Unlock" ¬
-                with icon caution ¬
-                with title "App Locker"
-            return text returned of userInput
-        end tell
-        '''
-
-        try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+        call, seconds_left = prompt_call(app_name, remaining, attempt > 0, deadline)
+        if seconds_left <= 0:
+            return False
 
-            # User clicked Cancel or closed dialog
-            if result.returncode != 0:
+        output = None
+        if use_session:
+            try:
+                output = DIALOG_SESSION.run_bytes(call, timeout=seconds_left + 5)
+            except (subprocess.TimeoutExpired, RuntimeError, OSError) as e:
+                print(f"Dialog session error, falling back to one-shot osascript: {e}")
+            if output is not None and not (output.startswith(b"OK:") or output == b"CANCEL"):
+                print("Unexpected dialog session output, falling back to one-shot osascript")
+                output[:] = bytes(len(output))
+                output = None
+            if output is None:
+                # A broken channel is not a wrong password - give the user a
+                # fresh time budget in a plain osascript dialog instead
+                use_session = False
+                deadline = time.time() + UNLOCK_TIMEOUT
+                call, seconds_left = prompt_call(app_name, remaining, attempt > 0, deadline)
+
+        if output is None:
+            try:
+                output = prompt_password_once(call, timeout=seconds_left + 5)
+            except subprocess.TimeoutExpired:
+                return False
+            except Exception as e:
+                print(f"Dialog error: {e}")
                 return False
 
-            entered_password = result.stdout.strip()
+        try:
+            # User clicked Cancel, closed dialog, or the script failed
+            if not output.startswith(b"OK:"):
+                return False
 
-            # Check password
-            if hash_password(entered_password) == config["password_hash"]:
-                return True
-            else:
-                # Wrong password - show error
-                error_script = f'''
-                tell application "System Events"
-                    display dialog "❌ Wrong password!" ¬
-                        buttons {{"OK"}} ¬
-                        default button "OK" ¬
-                        with icon stop ¬
-                        with title "App Locker"
-                end tell
-                '''
-                subprocess.run(['osascript', '-e', error_script], capture_output=True, timeout=10)
-
-        except subprocess.TimeoutExpired:
-            return False
-        except Exception as e:
-            print(f"Dialog error: {e}")
-            return False
+            # Hash the password straight out of the output buffer (no copy),
+            # then wipe the buffer
+            with memoryview(output) as view:
+                if check_password(view[len(b"OK:"):], config):
+                    return True
+        finally:
+            output[:] = bytes(len(output))
 
     return False
 
@@ -180,21 +393,55 @@ def show_password_dialog(app_name):
 class AppLocker:
     # Grace period in seconds - app won't be blocked again after unlock
     GRACE_PERIOD = 60  # 1 minute grace period after unlock
+    # Process polling interval in seconds (only used without PyObjC)
+    POLL_INTERVAL = 0.3
 
     def __init__(self):
         self.config = load_config()
         self.locked_pids = set()  # Track PIDs we've already handled
         self.unlocked_apps = {}   # Track app_keyword -> unlock_timestamp
+        self._last_pids = set()   # PIDs seen on the previous poll (psutil fallback)
         self.running = False
-        self.handling_lock = threading.Lock()
+        self.compile_locked_apps()
+        # Spawn osascript now rather than on the first locked app
+        # (on failure it is retried lazily by the first AppleScript call)
+        for session in (OSA_SESSION, DIALOG_SESSION):
+            try:
+                session.ensure_started()
+            except Exception as e:
+                print(f"AppleScript error: {e}")
+
+        # Frozen apps waiting for the password dialog - only one dialog at a time
+        self._handler_queue = queue.Queue()
+        threading.Thread(target=self._drain_handler_queue, daemon=True).start()
+
+        self._launch_observer = None
+        if NSWorkspace is not None:
+            # Connect to the window server so workspace notifications are delivered
+            NSApplication.sharedApplication()
+            # Get notified by the system on every app launch
+            center = NSWorkspace.sharedWorkspace().notificationCenter()
+            self._launch_observer = center.addObserverForName_object_queue_usingBlock_(
+                "NSWorkspaceDidLaunchApplicationNotification",
+                None,
+                None,
+                self.app_did_launch
+            )
+
+    def compile_locked_apps(self):
+        """Build the keyword matcher from config - call again after config changes."""
+        self._locked_lower = [k.lower() for k in self.config["locked_apps"]]
+        if self._locked_lower:
+            self._locked_re = re.compile("|".join(re.escape(k) for k in self._locked_lower))
+        else:
+            self._locked_re = None  # An empty pattern would match everything
 
     def get_matching_keyword(self, proc_name):
         """Get the locked app keyword that matches this process name."""
-        proc_name_lower = proc_name.lower()
-        for locked_app in self.config["locked_apps"]:
-            if locked_app.lower() in proc_name_lower:
-                return locked_app.lower()
-        return None
+        if self._locked_re is None:
+            return None
+        m = self._locked_re.search(proc_name.lower())
+        return m.group(0) if m else None
 
     def is_locked_app(self, proc_name):
         """Check if process name matches any locked app (case-insensitive partial match)."""
@@ -203,55 +450,89 @@ class AppLocker:
             return False
 
         # Check if this app was recently unlocked (grace period)
-        with self.handling_lock:
-            if keyword in self.unlocked_apps:
-                unlock_time = self.unlocked_apps[keyword]
-                if time.time() - unlock_time < self.GRACE_PERIOD:
-                    return False  # Still in grace period, don't block
-                else:
-                    # Grace period expired, remove from unlocked
-                    del self.unlocked_apps[keyword]
+        # (no pop on expiry - the worker may be writing a fresh unlock time)
+        unlock_time = self.unlocked_apps.get(keyword)
+        if unlock_time is not None and time.time() - unlock_time < self.GRACE_PERIOD:
+            return False  # Still in grace period, don't block
 
         return True
 
-    def handle_locked_app(self, proc, display_name):
-        """Handle a detected locked app - KILL FIRST, ASK LATER."""
-        pid = proc.pid
+    def handle_locked_app(self, pid, display_name):
+        """Ask for the password for an already frozen locked app."""
         keyword = self.get_matching_keyword(display_name)
+        decided = False
 
-        # Thread-safe check if already handling
-        with self.handling_lock:
-            if pid in self.locked_pids:
+        try:
+            # Already killed by stop()
+            if pid not in self.locked_pids:
                 return
-            self.locked_pids.add(pid)
 
-        try:
-            # IMMEDIATELY KILL THE PROCESS - no window should appear
-            print(f"🚫 Blocked: {display_name} (PID: {pid})")
-            try:
-                proc.kill()  # Force kill immediately
-            except:
-                terminate_process(pid)
+            # Another process of this app may have been unlocked while we waited
+            if not self.is_locked_app(display_name):
+                resume_process(pid)
+                show_app(display_name)
+                decided = True
+                return
 
             # Now show password dialog
-            authenticated = show_password_dialog(display_name)
+            authenticated = show_password_dialog(display_name, self.config)
 
             if authenticated:
                 # Add to unlocked apps with grace period
-                with self.handling_lock:
-                    self.unlocked_apps[keyword] = time.time()
+                self.unlocked_apps[keyword] = time.time()
 
-                # Relaunch the app
+                # Let the frozen app carry on where it was
                 print(f"✅ {display_name} unlocked (grace: {self.GRACE_PERIOD}s)")
-                open_app(display_name)
+                resume_process(pid)
+                show_app(display_name)
             else:
                 print(f"❌ {display_name} access denied")
+                terminate_process(pid)
+            decided = True
 
         finally:
+            # Never leave a process frozen without a decision
+            if not decided and pid in self.locked_pids:
+                terminate_process(pid)
             # Remove from tracked PIDs
-            time.sleep(0.5)
-            with self.handling_lock:
+            self.locked_pids.discard(pid)
+
+    def _drain_handler_queue(self):
+        """Worker thread: handle frozen locked apps one at a time."""
+        while True:
+            item = self._handler_queue.get()
+            if item is None:
+                break  # stop() was called
+            pid, display_name = item
+            try:
+                self.handle_locked_app(pid, display_name)
+            except Exception as e:
+                print(f"Handler error: {e}")
+
+    def check_process(self, pid, name):
+        """Freeze a locked app and queue it for the password dialog."""
+        # Skip if already being handled
+        if pid in self.locked_pids:
+            return
+
+        if self.is_locked_app(name):
+            # Track before freezing so stop() always sees a frozen pid
+            self.locked_pids.add(pid)
+            # IMMEDIATELY FREEZE THE PROCESS - it keeps its state but can't run
+            if not freeze_process(pid):
                 self.locked_pids.discard(pid)
+                return  # Already exited
+            print(f"🚫 Blocked: {name} (PID: {pid})")
+            # Best effort: get its last frame off screen without holding up detection
+            threading.Thread(target=hide_app, args=(name,), daemon=True).start()
+            self._handler_queue.put((pid, name))
+
+    def app_did_launch(self, notification):
+        """Called by NSWorkspace when any app launches."""
+        app = notification.userInfo().get("NSWorkspaceApplicationKey")
+        if not app or not app.localizedName():
+            return
+        self.check_process(app.processIdentifier(), app.localizedName())
 
     def monitor(self):
         """Main monitoring loop."""
@@ -260,43 +541,97 @@ class AppLocker:
         print(f"Monitoring (keywords): {', '.join(self.config['locked_apps'])}")
         print("")
         print("⚠️  PASSWORD: 1234")
+        if self.config.get("kdf") != "scrypt":
+            print("⚠️  Legacy password hash - use 'Change Password' to upgrade it")
         print("")
         print("Press Ctrl+C to stop")
         print("=" * 50)
 
         self.running = True
+        self._exit_signal = None
+        # Closing the terminal or `kill` must not leave locked apps frozen either
+        previous_handlers = {
+            sig: signal.signal(sig, self._on_exit_signal)
+            for sig in (signal.SIGTERM, signal.SIGHUP)
+        }
+
+        try:
+            self._watch()
+        finally:
+            # Don't leave locked apps frozen once we stop watching
+            self.stop()
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+
+        if self._exit_signal is not None:
+            raise SystemExit(128 + self._exit_signal)
+
+    def _on_exit_signal(self, signum, frame):
+        """SIGTERM/SIGHUP: leave the watch loop so monitor can clean up and exit."""
+        print(f"\n🛑 App Locker stopped (signal {signum})")
+        self._exit_signal = signum
+        self.running = False
 
+    def _watch(self):
+        """Watch for locked apps until Ctrl+C."""
+        if NSWorkspace is not None:
+            # Launch notifications only cover new apps - lock the ones already running
+            for app in NSWorkspace.sharedWorkspace().runningApplications():
+                if app.localizedName():
+                    self.check_process(app.processIdentifier(), app.localizedName())
+
+            # Event driven: app_did_launch is called from the run loop. Run it in
+            # short slices so Ctrl+C and stop() are noticed between events.
+            try:
+                while self.running:
+                    handled = NSRunLoop.currentRunLoop().runMode_beforeDate_(
+                        "NSDefaultRunLoopMode",
+                        NSDate.dateWithTimeIntervalSinceNow_(0.5)
+                    )
+                    if not handled:
+                        time.sleep(0.5)  # No input sources attached - don't spin
+            except KeyboardInterrupt:
+                print("\n🛑 App Locker stopped")
+            return
+
+        # Fallback without PyObjC: poll the process list
         while self.running:
             try:
-                for proc in psutil.process_iter(['pid', 'name']):
+                # Only look at PIDs that appeared since the last tick
+                current = set(psutil.pids())
+                for pid in current - self._last_pids:
+                    # Skip if already being handled, before any name lookup
+                    if pid in self.locked_pids:
+                        continue
+
                     try:
-                        name = proc.info['name']
-                        pid = proc.info['pid']
-
-                        # Skip if already being handled
-                        if pid in self.locked_pids:
-                            continue
-
-                        if self.is_locked_app(name):
-                            # Handle in separate thread to not block monitoring
-                            threading.Thread(
-                                target=self.handle_locked_app,
-                                args=(proc, name),
-                                daemon=True
-                            ).start()
+                        name = psutil.Process(pid).name()
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
+                        continue
 
-                time.sleep(self.config["check_interval"])
+                    if name:
+                        self.check_process(pid, name)
+                self._last_pids = current
+
+                time.sleep(self.POLL_INTERVAL)
 
             except KeyboardInterrupt:
                 print("\n🛑 App Locker stopped")
-                self.running = False
                 break
 
     def stop(self):
-        """Stop the locker."""
+        """Stop the locker and kill any locked app still frozen."""
         self.running = False
+        if self._launch_observer is not None:
+            # Otherwise a later AppLocker would see every launch twice
+            center = NSWorkspace.sharedWorkspace().notificationCenter()
+            center.removeObserver_(self._launch_observer)
+            self._launch_observer = None
+        # End the worker thread once it has finished its current item
+        self._handler_queue.put(None)
+        for pid in list(self.locked_pids):
+            terminate_process(pid)
+            self.locked_pids.discard(pid)
 
 # ============== CLI INTERFACE ==============
 
@@ -304,19 +639,22 @@ def change_password():
     """Change the locker password."""
     config = load_config()
 
-    current = input("Enter current password: ")
-    if hash_password(current) != config["password_hash"]:
+    current = getpass("Enter current password: ")
+    if not check_password(current, config):
         print("❌ Wrong password!")
         return
 
-    new_pass = input("Enter new password: ")
-    confirm = input("Confirm new password: ")
+    new_pass = getpass("Enter new password: ")
+    confirm = getpass("Confirm new password: ")
 
     if new_pass != confirm:
         print("❌ Passwords don't match!")
         return
 
-    config["password_hash"] = hash_password(new_pass)
+    # Always store a freshly salted scrypt hash (also upgrades legacy configs)
+    config["kdf"] = "scrypt"
+    config["salt"] = secrets.token_bytes(16).hex()
+    config["password_hash"] = hash_password(new_pass, config)
     save_config(config)
     print("✅ Password changed successfully!")
 
@@ -360,34 +698,32 @@ def remove_app():
 
 def main():
     """Main entry point with menu."""
-    print("\n" + "=" * 50)
-    print("       🔒 macOS APP LOCKER")
-    print("=" * 50)
-    print("\n1. Start App Locker")
-    print("2. Change Password")
-    print("3. Add App to Lock")
-    print("4. Remove App from Lock")
-    print("5. Exit")
-
-    choice = input("\nSelect option: ").strip()
-
-    if choice == "1":
-        locker = AppLocker()
-        locker.monitor()
-    elif choice == "2":
-        change_password()
-    elif choice == "3":
-        add_app()
-    elif choice == "4":
-        remove_app()
-    elif choice == "5":
-        print("Goodbye!")
-        return
-    else:
-        print("Invalid option")
-
-    # Loop back to menu
-    main()
+    while True:
+        print("\n" + "=" * 50)
+        print("       🔒 macOS APP LOCKER")
+        print("=" * 50)
+        print("\n1. Start App Locker")
+        print("2. Change Password")
+        print("3. Add App to Lock")
+        print("4. Remove App from Lock")
+        print("5. Exit")
+
+        choice = input("\nSelect option: ").strip()
+
+        if choice == "1":
+            locker = AppLocker()
+            locker.monitor()
+        elif choice == "2":
+            change_password()
+        elif choice == "3":
+            add_app()
+        elif choice == "4":
+            remove_app()
+        elif choice == "5":
+            print("Goodbye!")
+            break
+        else:
+            print("Invalid option")
 
 if __name__ == "__main__":
     main()
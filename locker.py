@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 AppLocker - Touch ID protected app lock for macOS
-Uses activation observation instead of launch observation
+Uses activation observation by default, launch observation via "watch_mode"
 """
 
 import json
@@ -17,6 +17,12 @@ CONFIG_PATH = Path(__file__).parent / "config.json"
 
 AUTH_GRACE_PERIOD = 30
 
+# "watch_mode" config value -> NSWorkspace notification that triggers auth
+WATCH_NOTIFICATIONS = {
+    "activate": "NSWorkspaceDidActivateApplicationNotification",
+    "launch": "NSWorkspaceDidLaunchApplicationNotification",
+}
+
 
 def load_config():
     if CONFIG_PATH.exists():
@@ -25,15 +31,6 @@ def load_config():
     return {"locked_apps": []}
 
 
-def get_app_by_name(app_name):
-    """Find running app by name"""
-    workspace = NSWorkspace.sharedWorkspace()
-    for app in workspace.runningApplications():
-        if app.localizedName() == app_name:
-            return app
-    return None
-
-
 def authenticate(app_name: str) -> bool:
     """Trigger Touch ID authentication with password fallback"""
     context = LAContext()
@@ -64,9 +61,12 @@ def authenticate(app_name: str) -> bool:
     start = time.time()
     
     while not result["done"] and (time.time() - start) < timeout:
+        # Wake often at first so a quick Touch ID success is picked up fast,
+        # then back off while the user is still at the prompt
+        interval = 0.01 if (time.time() - start) < 2 else 0.1
         NSRunLoop.currentRunLoop().runMode_beforeDate_(
             "NSDefaultRunLoopMode",
-            NSDate.dateWithTimeIntervalSinceNow_(0.1)
+            NSDate.dateWithTimeIntervalSinceNow_(interval)
         )
     
     return result["success"]
@@ -79,27 +79,69 @@ class AppLaunchObserver(NSObject):
         if self is None:
             return None
         self.config = load_config()
+        self._locked_set = frozenset(self.config["locked_apps"])
+        mode = self.config.get("watch_mode", "activate")
+        self.notification_name = WATCH_NOTIFICATIONS.get(mode, WATCH_NOTIFICATIONS["activate"])
+        self.grace_period = self.config.get("grace_period", AUTH_GRACE_PERIOD)
         self.authenticated_apps = {}
         self.pending_auth = False
+        # Running apps by name, kept current by launch/terminate notifications
+        self._apps_by_name = {}
         return self
     
     def startObserving(self):
         workspace = NSWorkspace.sharedWorkspace()
         center = workspace.notificationCenter()
         
+        for app in workspace.runningApplications():
+            if app.localizedName():
+                self._apps_by_name[app.localizedName()] = app
+        
         center.addObserver_selector_name_object_(
             self,
-            "appDidActivate:",
-            "NSWorkspaceDidActivateApplicationNotification",
+            "appDidLaunch:",
+            "NSWorkspaceDidLaunchApplicationNotification",
+            None
+        )
+        center.addObserver_selector_name_object_(
+            self,
+            "appDidTerminate:",
+            "NSWorkspaceDidTerminateApplicationNotification",
+            None
+        )
+        center.addObserver_selector_name_object_(
+            self,
+            "appEvent:",
+            self.notification_name,
             None
         )
         print("AppLocker running. Watching for:", self.config["locked_apps"])
     
-    def appDidActivate_(self, notification):
-        """Called when any app becomes active (foreground)"""
+    def appDidLaunch_(self, notification):
+        """Track newly launched apps by name"""
+        app = notification.userInfo().get("NSWorkspaceApplicationKey")
+        if app and app.localizedName():
+            self._apps_by_name[app.localizedName()] = app
+    
+    def appDidTerminate_(self, notification):
+        """Forget terminated apps"""
+        app = notification.userInfo().get("NSWorkspaceApplicationKey")
+        if not app or not app.localizedName():
+            return
+        known = self._apps_by_name.get(app.localizedName())
+        if known is not None and known.processIdentifier() == app.processIdentifier():
+            del self._apps_by_name[app.localizedName()]
+    
+    @objc.python_method
+    def get_app_by_name(self, app_name):
+        """Find running app by name"""
+        return self._apps_by_name.get(app_name)
+    
+    def appEvent_(self, notification):
+        """Called when any app becomes active or launches (per watch_mode)"""
         app_info = notification.userInfo()
         
-        # Activation notification uses NSWorkspaceApplicationKey directly
+        # Both notifications carry the app under NSWorkspaceApplicationKey
         app = app_info.get("NSWorkspaceApplicationKey")
         if not app:
             return
@@ -108,13 +150,13 @@ class AppLaunchObserver(NSObject):
         if not app_name:
             return
         
-        if app_name not in self.config["locked_apps"]:
+        if app_name not in self._locked_set:
             return
         
         # Check grace period
         if app_name in self.authenticated_apps:
             elapsed = time.time() - self.authenticated_apps[app_name]
-            if elapsed < AUTH_GRACE_PERIOD:
+            if elapsed < self.grace_period:
                 return
         
         if self.pending_auth:
@@ -123,6 +165,10 @@ class AppLaunchObserver(NSObject):
         print(f"Locked app activated: {app_name}")
         self.pending_auth = True
         
+        # appDidLaunch_ may not have run yet for this notification - observer
+        # order is undefined, and the lookups below must find the app
+        self._apps_by_name[app_name] = app
+        
         success = authenticate(app_name)
         
         if success:
@@ -130,12 +176,12 @@ class AppLaunchObserver(NSObject):
             self.authenticated_apps[app_name] = time.time()
             
             time.sleep(0.2)
-            fresh_app = get_app_by_name(app_name)
+            fresh_app = self.get_app_by_name(app_name)
             if fresh_app and not fresh_app.isTerminated():
                 fresh_app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
         else:
             print(f"❌ Auth failed, terminating: {app_name}")
-            fresh_app = get_app_by_name(app_name)
+            fresh_app = self.get_app_by_name(app_name)
             if fresh_app and not fresh_app.isTerminated():
                 fresh_app.terminate()
         
@@ -143,6 +189,7 @@ class AppLaunchObserver(NSObject):
     
     def reloadConfig(self):
         self.config = load_config()
+        self._locked_set = frozenset(self.config["locked_apps"])
         print("Config reloaded:", self.config["locked_apps"])
 
 
@@ -60,9 +60,11 @@ def test_touch_id():
     
     while not result["done"] and (time.time() - start) < timeout:
         # Process events - THIS IS KEY for dialog to work
+        # Short wakeups for the first 2s, then back off to 0.1s
+        interval = 0.01 if (time.time() - start) < 2 else 0.1
         NSRunLoop.currentRunLoop().runMode_beforeDate_(
             "NSDefaultRunLoopMode",
-            NSDate.dateWithTimeIntervalSinceNow_(0.1)
+            NSDate.dateWithTimeIntervalSinceNow_(interval)
         )
     
     if not result["done"]: